@@ -47,20 +47,17 @@ export async function POST(request: NextRequest, { params }: RouteParams) {
     // Build conversation history from previous messages for context
     const conversationHistory = buildConversationHistory(conversation.messages);
 
-    // Add user message
-    await addUserMessage(id, content);
-
     // Generate title if first message (run in parallel with council)
     const titlePromise = isFirstMessage
       ? generateConversationTitle(content)
       : Promise.resolve(null);
 
-    // Run the 3-stage council process (with conversation history for context)
-    const { stage1, stage2, stage3, metadata } = await runFullCouncil(
-      content,
-      userConfig,
-      conversationHistory
-    );
+    // Run the 3-stage council process (with conversation history for context),
+    // saving the user message while the council runs
+    const [{ stage1, stage2, stage3, metadata }] = await Promise.all([
+      runFullCouncil(content, userConfig, conversationHistory),
+      addUserMessage(id, content),
+    ]);
 
     // Wait for title generation if it was started
     const title = await titlePromise;
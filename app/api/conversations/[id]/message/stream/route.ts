@@ -63,22 +63,19 @@ export async function POST(request: NextRequest, { params }: RouteParams) {
       };
 
       try {
-        // Add user message
-        await addUserMessage(id, content);
-
         // Start title generation in parallel (don't await yet)
         let titlePromise: Promise<string> | null = null;
         if (isFirstMessage) {
           titlePromise = generateConversationTitle(content);
         }
 
-        // Stage 1: Collect responses (with conversation history for context)
+        // Stage 1: Collect responses (with conversation history for context),
+        // saving the user message while the council models respond
         sendEvent({ type: "stage1_start" });
-        const stage1Results: Stage1Result[] = await stage1CollectResponses(
-          content,
-          userConfig,
-          conversationHistory
-        );
+        const [stage1Results]: [Stage1Result[], void] = await Promise.all([
+          stage1CollectResponses(content, userConfig, conversationHistory),
+          addUserMessage(id, content),
+        ]);
         sendEvent({ type: "stage1_complete", data: stage1Results });
 
         // Stage 2: Collect rankings (using user's council models if provided)
@@ -14,10 +14,13 @@ interface OpenRouterModel {
   };
 }
 
+// Model sync currently running in this instance, if any
+let syncInFlight: Promise<void> | null = null;
+
 /**
  * Sync models from OpenRouter to database
  * - Adds new models
- * - Updates existing models
+ * - Updates existing models whose details changed
  * - Marks removed models as inactive
  */
 async function syncModelsToDatabase(openRouterModels: OpenRouterModel[]) {
@@ -25,29 +28,43 @@ async function syncModelsToDatabase(openRouterModels: OpenRouterModel[]) {
 
   // Get all existing models from database
   const existingModels = await prisma.lLMModel.findMany();
-  const existingModelIds = new Set(existingModels.map(m => m.id));
-
-  // Prepare upsert operations for all OpenRouter models
-  const upsertPromises = openRouterModels.map(model =>
-    prisma.lLMModel.upsert({
+  const existingById = new Map(existingModels.map(m => [m.id, m]));
+
+  const toRow = (model: OpenRouterModel) => ({
+    name: model.name,
+    description: model.description || null,
+    context_length: model.context_length || null,
+    pricing_prompt: model.pricing?.prompt || null,
+    pricing_completion: model.pricing?.completion || null,
+    is_active: true, // Re-activate if it was previously marked inactive
+  });
+
+  const newModels = openRouterModels.filter(m => !existingById.has(m.id));
+
+  // Only rewrite known models whose stored fields actually differ
+  const changedModels = openRouterModels.filter(model => {
+    const existing = existingById.get(model.id);
+    if (!existing) return false;
+    const row = toRow(model);
+    return (Object.keys(row) as (keyof typeof row)[]).some(
+      key => existing[key] !== row[key]
+    );
+  });
+
+  // Bulk-insert new models in a single multi-row INSERT
+  const createOperations = newModels.length > 0
+    ? [
+        prisma.lLMModel.createMany({
+          data: newModels.map(model => ({ id: model.id, ...toRow(model) })),
+          skipDuplicates: true,
+        }),
+      ]
+    : [];
+
+  const updateOperations = changedModels.map(model =>
+    prisma.lLMModel.update({
       where: { id: model.id },
-      create: {
-        id: model.id,
-        name: model.name,
-        description: model.description || null,
-        context_length: model.context_length || null,
-        pricing_prompt: model.pricing?.prompt || null,
-        pricing_completion: model.pricing?.completion || null,
-        is_active: true,
-      },
-      update: {
-        name: model.name,
-        description: model.description || null,
-        context_length: model.context_length || null,
-        pricing_prompt: model.pricing?.prompt || null,
-        pricing_completion: model.pricing?.completion || null,
-        is_active: true, // Re-activate if it was previously marked inactive
-      },
+      data: toRow(model),
     })
   );
 
@@ -56,19 +73,26 @@ async function syncModelsToDatabase(openRouterModels: OpenRouterModel[]) {
     .filter(m => !openRouterModelIds.has(m.id) && m.is_active)
     .map(m => m.id);
 
-  const deactivatePromise = modelsToDeactivate.length > 0
-    ? prisma.lLMModel.updateMany({
-        where: { id: { in: modelsToDeactivate } },
-        data: { is_active: false },
-      })
-    : Promise.resolve();
-
-  // Execute all operations
-  await Promise.all([...upsertPromises, deactivatePromise]);
+  const deactivateOperations = modelsToDeactivate.length > 0
+    ? [
+        prisma.lLMModel.updateMany({
+          where: { id: { in: modelsToDeactivate } },
+          data: { is_active: false },
+        }),
+      ]
+    : [];
+
+  // Execute all operations as a single batched transaction (one round-trip,
+  // rolled back together if any statement fails)
+  await prisma.$transaction([
+    ...createOperations,
+    ...updateOperations,
+    ...deactivateOperations,
+  ]);
 
   return {
-    added: openRouterModels.filter(m => !existingModelIds.has(m.id)).length,
-    updated: openRouterModels.filter(m => existingModelIds.has(m.id)).length,
+    added: newModels.length,
+    updated: changedModels.length,
     deactivated: modelsToDeactivate.length,
   };
 }
@@ -129,12 +153,18 @@ export async function GET() {
       }))
       .sort((a: OpenRouterModel, b: OpenRouterModel) => a.name.localeCompare(b.name)) || [];
 
-    // Sync to database (non-blocking - don't wait for it to complete)
-    syncModelsToDatabase(models).then(stats => {
-      console.log(`Models sync: ${stats.added} added, ${stats.updated} updated, ${stats.deactivated} deactivated`);
-    }).catch(err => {
-      console.error("Failed to sync models to database:", err);
-    });
+    // Sync to database (non-blocking - don't wait for it to complete).
+    // Concurrent requests share the sync already in flight rather than
+    // racing each other with duplicate writes.
+    if (!syncInFlight) {
+      syncInFlight = syncModelsToDatabase(models).then(stats => {
+        console.log(`Models sync: ${stats.added} added, ${stats.updated} updated, ${stats.deactivated} deactivated`);
+      }).catch(err => {
+        console.error("Failed to sync models to database:", err);
+      }).finally(() => {
+        syncInFlight = null;
+      });
+    }
 
     return NextResponse.json({ models, total: models.length });
   } catch (error) {
@@ -67,13 +67,15 @@ export default function HomePage() {
     checkHealth();
   }, []);
 
-  // Load conversations on mount and when showArchived or currentUser changes
+  // Load conversations on mount and when currentUser changes. Archived
+  // conversations are always fetched and filtered by the sidebar, so toggling
+  // showArchived doesn't need another round-trip
   React.useEffect(() => {
     const loadConversations = async () => {
       try {
         setIsLoadingConversations(true);
         // Pass userId for row-level security
-        const convs = await api.listConversations(showArchived, currentUser?.id);
+        const convs = await api.listConversations(true, currentUser?.id);
         setConversations(convs);
         setError(null);
       } catch (err) {
@@ -86,7 +88,7 @@ export default function HomePage() {
     if (backendHealthy) {
       loadConversations();
     }
-  }, [backendHealthy, showArchived, currentUser?.id]);
+  }, [backendHealthy, currentUser?.id]);
 
   // Load messages when active conversation changes
   React.useEffect(() => {
@@ -53,10 +53,9 @@ export function ConversationSidebar({
   onToggleShowArchived,
   isLoading,
 }: ConversationSidebarProps) {
-  const formatDate = (dateString: string) => {
+  const formatDate = (dateString: string, now: number = Date.now()) => {
     const date = new Date(dateString);
-    const now = new Date();
-    const diffMs = now.getTime() - date.getTime();
+    const diffMs = now - date.getTime();
     const diffDays = Math.floor(diffMs / (1000 * 60 * 60 * 24));
 
     if (diffDays === 0) return "Today";
@@ -82,8 +81,9 @@ export function ConversationSidebar({
   // Group conversations by date
   const groupedConversations = React.useMemo(() => {
     const groups: Record<string, ConversationMetadata[]> = {};
+    const now = Date.now();
     activeConvs.forEach((conv) => {
-      const dateKey = formatDate(conv.created_at);
+      const dateKey = formatDate(conv.created_at, now);
       if (!groups[dateKey]) groups[dateKey] = [];
       groups[dateKey].push(conv);
     });
@@ -13,6 +13,9 @@ import type {
   Stage3Result,
   Message,
   Conversation,
+  ModelScore,
+  OverallScores,
+  UserModelConfig,
 } from "./types";
 
 // Re-export types for convenience
@@ -23,6 +26,9 @@ export type {
   Stage3Result,
   Message,
   Conversation,
+  ModelScore,
+  OverallScores,
+  UserModelConfig,
 };
 
 export interface CouncilResponse {
@@ -62,24 +68,6 @@ export interface StreamEvent {
   message?: string;
 }
 
-export interface ModelScore {
-  model: string;
-  description?: string;
-  total_points: number;
-  rankings_received: number;
-  first_places: number;
-  second_places: number;
-  third_places: number;
-  average_position: number;
-  average_points: number;
-}
-
-export interface OverallScores {
-  leaderboard: ModelScore[];
-  total_conversations_analyzed: number;
-  total_rankings_processed: number;
-}
-
 /**
  * Check API health
  */
@@ -179,14 +167,6 @@ export async function deleteConversation(id: string, userId?: string): Promise<v
   }
 }
 
-/**
- * User model configuration for custom council
- */
-export interface UserModelConfig {
-  chairmanModel: string;
-  councilModels: string[];
-}
-
 /**
  * Send a message and get the council response (non-streaming)
  */
@@ -243,9 +223,17 @@ export async function sendMessageStream(
     const { done, value } = await reader.read();
     if (done) break;
 
-    buffer += decoder.decode(value, { stream: true });
-    const lines = buffer.split("\n");
-    buffer = lines.pop() || "";
+    // Only split once a chunk completes a line, so a large event arriving
+    // across many chunks isn't rescanned from the start on every read
+    const chunk = decoder.decode(value, { stream: true });
+    const lastNewline = chunk.lastIndexOf("\n");
+    if (lastNewline === -1) {
+      buffer += chunk;
+      continue;
+    }
+
+    const lines = (buffer + chunk.slice(0, lastNewline)).split("\n");
+    buffer = chunk.slice(lastNewline + 1);
 
     for (const line of lines) {
       if (line.startsWith("data: ")) {
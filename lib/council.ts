@@ -4,18 +4,17 @@
 
 import { queryModelsParallel, queryModel, type ChatMessage } from "./openrouter";
 import { COUNCIL_MODELS, CHAIRMAN_MODEL, TITLE_MODEL } from "./config";
-import type { Stage1Result, Stage2Result, Stage3Result, CouncilMetadata, Message } from "./types";
-
-// Re-export ChatMessage for use in other modules
-export type { ChatMessage };
-
-/**
- * User model configuration override
- */
-export interface UserModelConfig {
-  chairmanModel: string;
-  councilModels: string[];
-}
+import type {
+  Stage1Result,
+  Stage2Result,
+  Stage3Result,
+  CouncilMetadata,
+  Message,
+  UserModelConfig,
+} from "./types";
+
+// Re-export shared types for use in other modules
+export type { ChatMessage, UserModelConfig };
 
 /**
  * Build conversation history from previous messages for context.
@@ -293,35 +292,34 @@ export function calculateAggregateRankings(
   stage2Results: Stage2Result[],
   labelToModel: Record<string, string>
 ): CouncilMetadata["aggregate_rankings"] {
-  // Track positions for each model
-  const modelPositions: Map<string, number[]> = new Map();
+  // Track running position totals for each model
+  const modelPositions: Map<string, { sum: number; count: number }> = new Map();
 
   for (const ranking of stage2Results) {
     const parsedRanking = ranking.parsed_ranking;
 
     for (let position = 0; position < parsedRanking.length; position++) {
-      const label = parsedRanking[position];
-      if (label in labelToModel) {
-        const modelName = labelToModel[label];
-        if (!modelPositions.has(modelName)) {
-          modelPositions.set(modelName, []);
-        }
-        modelPositions.get(modelName)!.push(position + 1);
+      const modelName = labelToModel[parsedRanking[position]];
+      if (modelName === undefined) continue;
+
+      const totals = modelPositions.get(modelName);
+      if (totals) {
+        totals.sum += position + 1;
+        totals.count++;
+      } else {
+        modelPositions.set(modelName, { sum: position + 1, count: 1 });
       }
     }
   }
 
   // Calculate average position for each model
   const aggregate: CouncilMetadata["aggregate_rankings"] = [];
-  for (const [model, positions] of modelPositions) {
-    if (positions.length > 0) {
-      const avgRank = positions.reduce((a, b) => a + b, 0) / positions.length;
-      aggregate.push({
-        model,
-        average_rank: Math.round(avgRank * 100) / 100,
-        rankings_count: positions.length,
-      });
-    }
+  for (const [model, { sum, count }] of modelPositions) {
+    aggregate.push({
+      model,
+      average_rank: Math.round((sum / count) * 100) / 100,
+      rankings_count: count,
+    });
   }
 
   // Sort by average rank (lower is better)
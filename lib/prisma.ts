@@ -9,4 +9,6 @@ export const prisma = globalForPrisma.prisma ?? new PrismaClient({
   accelerateUrl: process.env.PRISMA_DATABASE_URL,
 });
 
-if (process.env.NODE_ENV !== "production") globalForPrisma.prisma = prisma;
+// Reuse a single client (and its connection pool) across hot reloads in
+// development and across route bundles sharing a warm serverless instance
+globalForPrisma.prisma = prisma;
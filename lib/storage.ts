@@ -2,42 +2,42 @@
  * Postgres storage for conversations using Prisma.
  */
 
+import { randomUUID } from "crypto";
+import type { Prisma } from "@prisma/client";
 import { prisma } from "./prisma";
 import type {
   Conversation,
   ConversationMetadata,
   Message,
+  ModelScore,
+  OverallScores,
   Stage1Result,
   Stage2Result,
   Stage3Result,
 } from "./types";
 
-// Simple UUID generation without external dependency
-function generateUUID(): string {
-  return 'xxxxxxxx-xxxx-4xxx-yxxx-xxxxxxxxxxxx'.replace(/[xy]/g, (c) => {
-    const r = Math.random() * 16 | 0;
-    const v = c === 'x' ? r : (r & 0x3 | 0x8);
-    return v.toString(16);
-  });
-}
-
-export interface ModelScore {
-  model: string;
-  description?: string;
-  total_points: number;
-  rankings_received: number;
-  first_places: number;
-  second_places: number;
-  third_places: number;
-  average_position: number;
-  average_points: number;
-}
-
-export interface OverallScores {
-  leaderboard: ModelScore[];
-  total_conversations_analyzed: number;
-  total_rankings_processed: number;
-}
+// Column selections for the conversation read paths, shared so the
+// conversation, metadata and message queries stay consistent
+const CONVERSATION_SELECT = {
+  id: true,
+  created_at: true,
+  title: true,
+} satisfies Prisma.ConversationSelect;
+
+const CONVERSATION_METADATA_SELECT = {
+  ...CONVERSATION_SELECT,
+  message_count: true,
+  archived: true,
+} satisfies Prisma.ConversationSelect;
+
+const MESSAGE_SELECT = {
+  role: true,
+  content: true,
+  stage1: true,
+  stage2: true,
+  stage3: true,
+  timestamp: true,
+} satisfies Prisma.MessageSelect;
 
 /**
  * Create a new conversation.
@@ -48,7 +48,7 @@ export async function createConversation(
   conversationId?: string,
   userId?: string
 ): Promise<Conversation> {
-  const id = conversationId || generateUUID();
+  const id = conversationId || randomUUID();
 
   const conv = await prisma.conversation.create({
     data: {
@@ -57,6 +57,7 @@ export async function createConversation(
       archived: false,
       user_id: userId || null,
     },
+    select: CONVERSATION_SELECT,
   });
 
   return {
@@ -84,20 +85,25 @@ export async function getConversation(
     whereClause.user_id = userId;
   }
 
-  const conv = await prisma.conversation.findFirst({
-    where: whereClause,
-    include: {
-      messages: {
-        orderBy: { timestamp: "asc" },
-      },
-    },
-  });
+  // Fetch the conversation row and its messages concurrently instead of
+  // waiting for the parent row before loading the relation
+  const [conv, rows] = await Promise.all([
+    prisma.conversation.findFirst({
+      where: whereClause,
+      select: CONVERSATION_SELECT,
+    }),
+    prisma.message.findMany({
+      where: { conversation_id: conversationId },
+      select: MESSAGE_SELECT,
+      orderBy: { timestamp: "asc" },
+    }),
+  ]);
 
   if (!conv) {
     return null;
   }
 
-  const messages: Message[] = conv.messages.map((msg) => {
+  const messages: Message[] = rows.map((msg) => {
     if (msg.role === "user") {
       return {
         role: "user" as const,
@@ -143,13 +149,10 @@ export async function listConversations(
     whereClause.user_id = userId;
   }
 
+  // message_count is maintained on insert, so no join against messages is needed
   const conversations = await prisma.conversation.findMany({
     where: whereClause,
-    include: {
-      _count: {
-        select: { messages: true },
-      },
-    },
+    select: CONVERSATION_METADATA_SELECT,
     orderBy: { created_at: "desc" },
   });
 
@@ -157,11 +160,29 @@ export async function listConversations(
     id: conv.id,
     created_at: conv.created_at.toISOString(),
     title: conv.title,
-    message_count: conv._count.messages,
+    message_count: conv.message_count,
     archived: conv.archived,
   }));
 }
 
+/**
+ * Insert a message and bump the conversation's denormalized message_count
+ * in a single nested write (one round-trip).
+ */
+async function appendMessage(
+  conversationId: string,
+  message: Prisma.MessageCreateWithoutConversationInput
+): Promise<void> {
+  await prisma.conversation.update({
+    where: { id: conversationId },
+    data: {
+      message_count: { increment: 1 },
+      messages: { create: message },
+    },
+    select: { id: true },
+  });
+}
+
 /**
  * Add a user message to a conversation.
  */
@@ -169,12 +190,9 @@ export async function addUserMessage(
   conversationId: string,
   content: string
 ): Promise<void> {
-  await prisma.message.create({
-    data: {
-      conversation_id: conversationId,
-      role: "user",
-      content,
-    },
+  await appendMessage(conversationId, {
+    role: "user",
+    content,
   });
 }
 
@@ -187,14 +205,11 @@ export async function addAssistantMessage(
   stage2: Stage2Result[],
   stage3: Stage3Result
 ): Promise<void> {
-  await prisma.message.create({
-    data: {
-      conversation_id: conversationId,
-      role: "assistant",
-      stage1: stage1 as unknown as object,
-      stage2: stage2 as unknown as object,
-      stage3: stage3 as unknown as object,
-    },
+  await appendMessage(conversationId, {
+    role: "assistant",
+    stage1: stage1 as unknown as object,
+    stage2: stage2 as unknown as object,
+    stage3: stage3 as unknown as object,
   });
 }
 
@@ -205,7 +220,8 @@ export async function updateConversationTitle(
   conversationId: string,
   title: string
 ): Promise<void> {
-  await prisma.conversation.update({
+  // updateMany skips reading the updated conversation back
+  await prisma.conversation.updateMany({
     where: { id: conversationId },
     data: { title },
   });
@@ -256,137 +272,109 @@ export async function deleteConversation(
   return result.count > 0;
 }
 
+interface ScoreRow {
+  total_conversations: number;
+  total_rankings: number;
+  // Null on the single totals-only row returned when nothing was ranked
+  model: string | null;
+  description: string | null;
+  total_points: number;
+  rankings_received: number;
+  first_places: number;
+  second_places: number;
+  third_places: number;
+  average_position: number;
+}
+
 /**
  * Calculate overall scores across all conversations.
  * Uses actual model names from Stage 1 data instead of anonymous labels.
+ * The leaderboard and totals are computed in a single Postgres statement.
  */
 export async function getOverallScores(): Promise<OverallScores> {
-  // Get all non-archived assistant messages with stage1 and stage2 data
-  const allMessages = await prisma.message.findMany({
-    where: {
-      role: "assistant",
-      conversation: { archived: false },
-    },
-    select: { stage1: true, stage2: true },
-  });
-
-  // Filter to only messages that have stage2 data
-  const messages = allMessages.filter((m) => m.stage2 !== null);
-
-  // Track scores per model
-  const modelScores: Map<
-    string,
-    {
-      total_points: number;
-      rankings_received: number;
-      first_places: number;
-      second_places: number;
-      third_places: number;
-      position_history: number[];
-    }
-  > = new Map();
-
-  let totalConversations = 0;
-  let totalRankings = 0;
-
-  for (const msg of messages) {
-    const stage1Data = msg.stage1 as Stage1Result[] | null;
-    const stage2Data = msg.stage2 as Stage2Result[] | null;
-
-    if (!stage2Data || !Array.isArray(stage2Data)) continue;
-
-    // Build label_to_model mapping from Stage 1 data
-    const labelToModel: Record<string, string> = {};
-    if (stage1Data && Array.isArray(stage1Data)) {
-      const labels = ["A", "B", "C", "D", "E", "F", "G", "H"];
-      stage1Data.forEach((result, index) => {
-        if (index < labels.length) {
-          labelToModel[`Response ${labels[index]}`] = result.model;
-        }
-      });
-    }
-
-    totalConversations++;
-    const numModels = stage2Data.length;
-
-    for (const rankingResult of stage2Data) {
-      const parsedRanking = rankingResult.parsed_ranking || [];
-      if (parsedRanking.length === 0) continue;
-
-      totalRankings++;
-
-      // Award points based on position (inverse ranking)
-      for (let position = 0; position < parsedRanking.length; position++) {
-        const rankedLabel = parsedRanking[position];
-        // Map anonymous label to actual model name, fallback to label if not found
-        const modelName = labelToModel[rankedLabel] || rankedLabel;
-        const points = numModels - position;
-
-        if (!modelScores.has(modelName)) {
-          modelScores.set(modelName, {
-            total_points: 0,
-            rankings_received: 0,
-            first_places: 0,
-            second_places: 0,
-            third_places: 0,
-            position_history: [],
-          });
-        }
-
-        const scores = modelScores.get(modelName)!;
-        scores.total_points += points;
-        scores.rankings_received++;
-        scores.position_history.push(position + 1);
-
-        if (position === 0) scores.first_places++;
-        else if (position === 1) scores.second_places++;
-        else if (position === 2) scores.third_places++;
-      }
-    }
-  }
+  // scored: non-archived assistant messages with Stage 2 rankings
+  // rankings: one row per ranking with a non-empty parsed_ranking
+  // placements: each ranked label ("Response A".."Response H") mapped back to
+  //   the Stage 1 model at that index (falling back to the label itself),
+  //   with inverse-rank points per position
+  // Totals are joined onto every leaderboard row, so the query always
+  // returns at least one row even when no rankings exist
+  const rows = await prisma.$queryRaw<ScoreRow[]>`
+    WITH scored AS (
+      SELECT m.stage1, m.stage2, jsonb_array_length(m.stage2) AS num_models
+      FROM messages m
+      JOIN conversations c ON c.id = m.conversation_id
+      WHERE m.role = 'assistant'
+        AND c.archived = false
+        AND jsonb_typeof(m.stage2) = 'array'
+    ),
+    rankings AS (
+      SELECT s.stage1, s.num_models, r.result->'parsed_ranking' AS parsed_ranking
+      FROM scored s
+      CROSS JOIN LATERAL jsonb_array_elements(s.stage2) AS r(result)
+      WHERE CASE
+        WHEN jsonb_typeof(r.result->'parsed_ranking') = 'array'
+          THEN jsonb_array_length(r.result->'parsed_ranking') > 0
+        ELSE false
+      END
+    ),
+    placements AS (
+      SELECT COALESCE(NULLIF(l.model, ''), p.label) AS model,
+             rk.num_models - p.pos + 1 AS points,
+             p.pos
+      FROM rankings rk
+      CROSS JOIN LATERAL jsonb_array_elements_text(rk.parsed_ranking)
+        WITH ORDINALITY AS p(label, pos)
+      LEFT JOIN LATERAL (
+        SELECT s1.result->>'model' AS model
+        FROM jsonb_array_elements(
+          CASE WHEN jsonb_typeof(rk.stage1) = 'array' THEN rk.stage1 ELSE '[]'::jsonb END
+        ) WITH ORDINALITY AS s1(result, idx)
+        WHERE s1.idx <= 8 AND p.label = 'Response ' || chr(64 + s1.idx::int)
+      ) l ON true
+    ),
+    leaderboard AS (
+      SELECT pl.model,
+             lm.description,
+             SUM(pl.points)::int AS total_points,
+             COUNT(*)::int AS rankings_received,
+             COUNT(*) FILTER (WHERE pl.pos = 1)::int AS first_places,
+             COUNT(*) FILTER (WHERE pl.pos = 2)::int AS second_places,
+             COUNT(*) FILTER (WHERE pl.pos = 3)::int AS third_places,
+             AVG(pl.pos)::float8 AS average_position
+      FROM placements pl
+      LEFT JOIN llm_models lm ON lm.id = pl.model
+      GROUP BY pl.model, lm.description
+    ),
+    totals AS (
+      SELECT (SELECT COUNT(*) FROM scored)::int AS total_conversations,
+             (SELECT COUNT(*) FROM rankings)::int AS total_rankings
+    )
+    SELECT t.total_conversations, t.total_rankings, lb.*
+    FROM totals t
+    LEFT JOIN leaderboard lb ON true
+    ORDER BY lb.total_points DESC, lb.model
+  `;
 
-  // Get all model IDs that have scores
-  const modelIds = Array.from(modelScores.keys());
-
-  // Fetch descriptions from LLMModel table
-  const modelDescriptions = await prisma.lLMModel.findMany({
-    where: { id: { in: modelIds } },
-    select: { id: true, description: true },
-  });
-
-  const descriptionMap = new Map<string, string | null>(
-    modelDescriptions.map((m: { id: string; description: string | null }) => [m.id, m.description])
-  );
-
-  // Calculate averages and build leaderboard
   const leaderboard: ModelScore[] = [];
-  for (const [model, scores] of modelScores) {
-    if (scores.rankings_received > 0) {
-      const avgPosition =
-        scores.position_history.reduce((a, b) => a + b, 0) /
-        scores.position_history.length;
-      const avgPoints = scores.total_points / scores.rankings_received;
-
-      leaderboard.push({
-        model,
-        description: descriptionMap.get(model) ?? undefined,
-        total_points: scores.total_points,
-        rankings_received: scores.rankings_received,
-        first_places: scores.first_places,
-        second_places: scores.second_places,
-        third_places: scores.third_places,
-        average_position: Math.round(avgPosition * 100) / 100,
-        average_points: Math.round(avgPoints * 100) / 100,
-      });
-    }
+  for (const row of rows) {
+    if (row.model === null) continue;
+    leaderboard.push({
+      model: row.model,
+      description: row.description ?? undefined,
+      total_points: row.total_points,
+      rankings_received: row.rankings_received,
+      first_places: row.first_places,
+      second_places: row.second_places,
+      third_places: row.third_places,
+      average_position: Math.round(row.average_position * 100) / 100,
+      average_points: Math.round((row.total_points / row.rankings_received) * 100) / 100,
+    });
   }
 
-  // Sort by total points descending
-  leaderboard.sort((a, b) => b.total_points - a.total_points);
-
   return {
     leaderboard,
-    total_conversations_analyzed: totalConversations,
-    total_rankings_processed: totalRankings,
+    total_conversations_analyzed: rows[0]?.total_conversations ?? 0,
+    total_rankings_processed: rows[0]?.total_rankings ?? 0,
   };
 }
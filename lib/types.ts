@@ -59,4 +59,30 @@ export interface CouncilMetadata {
   }>;
 }
 
+export interface ModelScore {
+  model: string;
+  description?: string;
+  total_points: number;
+  rankings_received: number;
+  first_places: number;
+  second_places: number;
+  third_places: number;
+  average_position: number;
+  average_points: number;
+}
+
+export interface OverallScores {
+  leaderboard: ModelScore[];
+  total_conversations_analyzed: number;
+  total_rankings_processed: number;
+}
+
+/**
+ * User model configuration for custom council
+ */
+export interface UserModelConfig {
+  chairmanModel: string;
+  councilModels: string[];
+}
+
 export type StageStatus = "idle" | "loading" | "complete" | "error";
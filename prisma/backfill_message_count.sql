@@ -0,0 +1,11 @@
+-- Backfill conversations.message_count for rows created before the column
+-- existed. Run once against existing databases after `prisma db push` adds
+-- the column.
+UPDATE conversations c
+SET message_count = m.count
+FROM (
+  SELECT conversation_id, COUNT(*)::int AS count
+  FROM messages
+  GROUP BY conversation_id
+) m
+WHERE m.conversation_id = c.id;